@@ -3,14 +3,78 @@ from io import BytesIO, StringIO
 from os import PathLike
 from typing import Optional
 
-from lxml.etree import XMLParser, fromstring, parse
+from lxml.etree import _Element, fromstring, iterparse
 
+from .base import ExtraTailError, ExtraTextError, TmxtagError
 from .inline import Bpt, Ept, Hi, It, Ph, Sub, Ut
 from .structural import Header, Map, Note, Prop, Seg, Tmx, Tu, Tuv, Ude
 
 
+def _check_tmx_root(root: _Element) -> None:
+    if root.tag != "tmx":
+        raise TmxtagError("tmx", root.tag)
+    text, tail = root.text, root.tail
+    if text and not text.isspace():
+        raise ExtraTextError("tmx", text)
+    if tail and not tail.isspace():
+        raise ExtraTailError("tmx", tail)
+
+
+def _check_tail(element: _Element) -> None:
+    tail = element.tail
+    if tail and not tail.isspace():
+        raise ExtraTailError(element.tag, tail)
+
+
 def from_tmx(file: str | bytes | PathLike) -> Tmx:
-    return Tmx(parse(file, XMLParser(remove_blank_text=True)).getroot())
+    tmx = Tmx()
+    context = iterparse(
+        file,
+        events=("start", "end"),
+        tag=("tmx", "header", "body", "tu"),
+        remove_blank_text=True,
+        load_dtd=False,
+        no_network=True,
+        collect_ids=False,
+        huge_tree=True,
+    )
+    root: Optional[_Element] = None
+    for event, element in context:
+        if root is None:
+            root = element.getroottree().getroot()
+            _check_tmx_root(root)
+            tmx.version = root.get("version", tmx.version)
+        parent = element.getparent()
+        if event == "start":
+            # Text and tails are only fully read once the next element starts.
+            if parent is root:
+                _check_tmx_root(root)
+                for previous in element.itersiblings("header", preceding=True):
+                    _check_tail(previous)
+        elif element.tag == "tu":
+            if parent is None or parent.tag != "body" or parent.getparent() is not root:
+                continue
+            tmx.tus.append(Tu(element))
+            # The tail is checked once the next tu or </body> is reached.
+            element.clear(keep_tail=True)
+            while (previous := element.getprevious()) is not None:
+                if previous.tag == "tu":
+                    _check_tail(previous)
+                del parent[0]
+        elif element.tag == "header":
+            if parent is root:
+                tmx.header = Header(element)
+        elif element.tag == "body":
+            if parent is root:
+                for tu in element.iterchildren("tu"):
+                    _check_tail(tu)
+        elif element is root:
+            _check_tmx_root(root)
+            for header in root.iterchildren("header"):
+                _check_tail(header)
+    if root is None:
+        _check_tmx_root(context.root)
+    return tmx
 
 
 def from_csv(
@@ -34,7 +98,7 @@ def from_csv(
         )
     else:
         tmx.header = header
-    with open(file, "r") as f:
+    with open(file, "r", encoding="utf-8", newline="") as f:
         for row in reader(f):
             tmx.tus.append(
                 Tu(
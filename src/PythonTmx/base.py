@@ -3,9 +3,21 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 from logging import warn
-from typing import ClassVar, Generator, MutableSequence, Optional, Type
+from sys import intern
+from types import MemberDescriptorType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generator,
+    MutableSequence,
+    Optional,
+    Type,
+)
 
-from lxml.etree import Element, _Element
+from lxml.etree import Element, SubElement, _Element
+
+_XML_LANG = intern("{http://www.w3.org/XML/1998/namespace}lang")
 
 
 class TmxAttributes(Enum):
@@ -36,7 +48,7 @@ class TmxAttributes(Enum):
     usagecount = "usagecount"
     version = "version"
     x = "x"
-    xmllang = "{http://www.w3.org/XML/1998/namespace}lang"
+    xmllang = _XML_LANG
 
 
 class TmxError(Exception):
@@ -64,45 +76,243 @@ class TmxtagError(Exception):
         )
 
 
+def _parse_date(value: Any) -> datetime:
+    """
+    Parses a TMX date (YYYYMMDDTHHMMSSZ), slicing the fields directly when the
+    value has the exact expected layout and falling back to strptime otherwise.
+    Raises the same ValueError and TypeError as strptime.
+    """
+    if (
+        value.__class__ is str
+        and len(value) == 16
+        and value[8] == "T"
+        and value[15] == "Z"
+        and value[:8].isdigit()
+        and value[9:15].isdigit()
+    ):
+        try:
+            return datetime(
+                int(value[:4]),
+                int(value[4:6]),
+                int(value[6:8]),
+                int(value[9:11]),
+                int(value[11:13]),
+                int(value[13:15]),
+            )
+        except ValueError:
+            pass
+    return datetime.strptime(value, r"%Y%m%dT%H%M%SZ")
+
+
+# Accepted values for the attributes restricted to a fixed set of values.
+_ASSOC_VALUES = frozenset(("p", "f", "b"))
+_POS_VALUES = frozenset(("begin", "end"))
+_SEGTYPE_VALUES = frozenset(("block", "paragraph", "sentence", "phrase"))
+
+
+def _format_str(element: TmxElement, name: str, value: Any) -> str:
+    try:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a str but got '{value.__class__.__name__}'")
+        return value
+    except TypeError as e:
+        raise TmxError(
+            f"Value for attribute {name} must be a str but got {value} of type '{value.__class__.__name__}'"
+        ) from e
+
+
+def _format_int(element: TmxElement, name: str, value: Any) -> str:
+    if not isinstance(value, int):
+        try:
+            value = int(value)
+        except (TypeError, ValueError) as e:
+            raise TmxError(
+                f"Value for attribute {name} must an int or convertible to an int but got {value} of type '{value.__class__.__name__}'"
+            ) from e
+    return str(value)
+
+
+def _format_date(element: TmxElement, name: str, value: Any) -> str:
+    if not isinstance(value, datetime):
+        try:
+            value = _parse_date(value)
+        except ValueError:
+            warn(
+                f"Value for attribute {name} is recommended to be in the format of YYYYMMDDTHHMMSSZ but got {value}"
+            )
+        except TypeError as e:
+            raise TmxError(
+                f"Value for attribute {name} must be a datetime object or a str"
+            ) from e
+    return (
+        f"{value.year:04d}{value.month:02d}{value.day:02d}"
+        f"T{value.hour:02d}{value.minute:02d}{value.second:02d}Z"
+    )
+
+
+def _format_assoc(element: TmxElement, name: str, value: Any) -> str:
+    try:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a str but got '{value.__class__.__name__}'")
+        value = value.lower()
+        if value not in _ASSOC_VALUES:
+            raise ValueError(f"Expected one of p, f or b but got {value}")
+        return value
+    except (TypeError, ValueError) as e:
+        raise TmxError(
+            f"Value for attribute {name} must be a str and one of p, f or b but got {value} of type '{value.__class__.__name__}'"
+        ) from e
+
+
+def _format_pos(element: TmxElement, name: str, value: Any) -> str:
+    try:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a str but got '{value.__class__.__name__}'")
+        value = value.lower()
+        if value not in _POS_VALUES:
+            raise ValueError(f"Expected one of begin or end but got {value}")
+        return value
+    except (TypeError, ValueError) as e:
+        raise TmxError(
+            f"Value for attribute {name} must be a str and one of begin or end but got {value} of type '{value.__class__.__name__}'"
+        ) from e
+
+
+def _format_segtype(element: TmxElement, name: str, value: Any) -> str:
+    try:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a str but got '{value.__class__.__name__}'")
+        value = value.lower()
+        if value not in _SEGTYPE_VALUES:
+            raise ValueError(
+                f"Expected one of block, paragraph, sentence or phrase but got {value}"
+            )
+        return value
+    except (TypeError, ValueError) as e:
+        raise TmxError(
+            f"Value for attribute {name} must be a str and one of block, paragraph, sentence or phrase but got {value} of type '{value.__class__.__name__}'"
+        ) from e
+
+
+def _format_unicode(element: TmxElement, name: str, value: Any) -> str:
+    try:
+        if not isinstance(value, str):
+            raise TypeError(f"Expected a str but got '{value.__class__.__name__}'")
+        if (
+            getattr(element, "code") is None
+            and getattr(element, "ent") is None
+            and getattr(element, "subst") is None
+        ):
+            raise ValueError("At least one the optional attributes must be set")
+        return value
+    except TypeError as e:
+        raise TmxError(
+            f"Value for attribute {name} must be a str and at least one the optional attributes must be set but got {value} of type '{value.__class__.__name__}'"
+        ) from e
+    except ValueError as e:
+        raise TmxError(*e.args) from e
+
+
+# Attributes whose values are converted or restricted when serializing, every
+# other attribute goes through _format_str.
+_FORMATTERS: dict[TmxAttributes, Callable[[TmxElement, str, Any], str]] = {
+    TmxAttributes.i: _format_int,
+    TmxAttributes.x: _format_int,
+    TmxAttributes.usagecount: _format_int,
+    TmxAttributes.creationdate: _format_date,
+    TmxAttributes.changedate: _format_date,
+    TmxAttributes.lastusagedate: _format_date,
+    TmxAttributes.assoc: _format_assoc,
+    TmxAttributes.pos: _format_pos,
+    TmxAttributes.segtype: _format_segtype,
+    TmxAttributes.unicode: _format_unicode,
+}
+
+
 class TmxElement:
+    __slots__ = ("_content",)
+    _tag: ClassVar[str]
     _content: MutableSequence
     _required_attributes: ClassVar[tuple[TmxAttributes, ...]]
     _optional_attributes: ClassVar[tuple[TmxAttributes, ...]]
+    _all_attributes: ClassVar[tuple[TmxAttributes, ...]]
+    _attribute_names: ClassVar[
+        tuple[
+            tuple[
+                TmxAttributes,
+                str,
+                str,
+                Optional[Callable[[TmxElement, str, Any], str]],
+            ],
+            ...,
+        ]
+    ]
     _allowed_content: ClassVar[tuple[Type, ...]]
+    # Set by elements that cannot have content, _content is then read-only
+    # and assigning to it raises a ValueError with this message.
+    _content_error: ClassVar[Optional[str]] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._tag = intern(cls.__name__.lower())
+        cls._all_attributes = (
+            *getattr(cls, "_required_attributes", ()),
+            *getattr(cls, "_optional_attributes", ()),
+        )
+        cls._attribute_names = tuple(
+            (
+                attribute,
+                attribute.name,
+                attribute.value,
+                _FORMATTERS.get(attribute),
+            )
+            for attribute in cls._all_attributes
+        )
+        message = cls.__dict__.get("_content_error")
+        if message is not None:
+            setattr(cls, "_content", _content_guard(message))
 
     def __init__(self, **kwargs) -> None:
         source_element: Optional[_Element] = kwargs.get("source_element", None)
-        self.__dict__["_content"] = []
-        if (
-            source_element is not None
-            and source_element.tag != self.__class__.__name__.lower()
-        ):
-            raise TmxtagError(self.__class__.__name__.lower(), source_element.tag)
-        for attribute in (*self._required_attributes, *self._optional_attributes):
+        # Bypasses the read-only guard of elements without content.
+        _CONTENT_SLOT.__set__(self, [])
+        if source_element is not None and source_element.tag != self._tag:
+            raise TmxtagError(self._tag, source_element.tag)
+        for attribute, name, xml_name, formatter in self._attribute_names:
+            val = kwargs.get(name, None)
             if source_element is not None:
-                val = source_element.get(
-                    attribute.value, kwargs.get(attribute.name, None)
-                )
-            else:
-                val = kwargs.get(attribute.name, None)
-            self.__setattr__(attribute.name, val)
+                val = source_element.get(xml_name, val)
+            if formatter is None or val is None:
+                setattr(self, name, val)
+                continue
             match attribute:
                 case TmxAttributes.i | TmxAttributes.x | TmxAttributes.usagecount:
                     try:
-                        self.__setattr__(attribute.name, int(val))
+                        val = int(val)
                     except (ValueError, TypeError):
-                        self.__setattr__(attribute.name, val)
+                        pass
                 case (
                     TmxAttributes.creationdate
                     | TmxAttributes.changedate
                     | TmxAttributes.lastusagedate
                 ):
                     try:
-                        self.__setattr__(
-                            attribute.name, datetime.strptime(val, r"%Y%m%dT%H%M%SZ")
-                        )
+                        val = _parse_date(val)
                     except (ValueError, TypeError):
                         pass
+            setattr(self, name, val)
+
+    def __setstate__(self, state) -> None:
+        # Used by copy and pickle. Slots are restored with setattr by default,
+        # which would trip the read-only _content guard.
+        dict_state, slots_state = state if isinstance(state, tuple) else (state, None)
+        for values in (dict_state, slots_state):
+            if values:
+                for name, value in values.items():
+                    if name == "_content":
+                        _CONTENT_SLOT.__set__(self, value)
+                    else:
+                        object.__setattr__(self, name, value)
 
     def xml_attrib(self) -> dict[str, str]:
         """
@@ -118,129 +328,35 @@ class TmxElement:
 
         Returns a dict of the element's attributes ready to be serialized by lxml
         """
-        xml_attributes: dict[str, str] = dict()
-        for attribute in (*self._required_attributes, *self._optional_attributes):
-            value = self.__getattribute__(attribute.name)
+        xml_attributes: dict[str, str] = {}
+        for attribute, name, xml_name, formatter in self._attribute_names:
+            value = getattr(self, name)
             if value is None:
-                if attribute.name in self._required_attributes:
-                    raise TmxError(
-                        f"Required attribute {attribute.name} is missing from element {self.__class__.__name__}"
-                    ) from AttributeError
-                else:
+                continue
+            if formatter is None:
+                if value.__class__ is str:
+                    xml_attributes[xml_name] = value
                     continue
-            match attribute:
-                case TmxAttributes.x | TmxAttributes.i | TmxAttributes.usagecount:
-                    if not isinstance(value, int):
-                        try:
-                            value = int(value)
-                        except (TypeError, ValueError) as e:
-                            raise TmxError(
-                                f"Value for attribute {attribute.name} must an int or convertible to an int but got {value} of type '{value.__class__.__name__}'"
-                            ) from e
-                    xml_attributes[attribute.value] = str(value)
-                case (
-                    TmxAttributes.creationdate
-                    | TmxAttributes.changedate
-                    | TmxAttributes.lastusagedate
-                ):
-                    if not isinstance(value, datetime):
-                        try:
-                            value = datetime.strptime(value, r"%Y%m%dT%H%M%SZ")
-                        except ValueError:
-                            warn(
-                                f"Value for attribute {attribute.name} is recommended to be in the format of YYYYMMDDTHHMMSSZ but got {value}"
-                            )
-                        except TypeError as e:
-                            raise TmxError(
-                                f"Value for attribute {attribute.name} must be a datetime object or a str"
-                            ) from e
-                    xml_attributes[attribute.value] = value.strftime(r"%Y%m%dT%H%M%SZ")
-                case TmxAttributes.assoc:
-                    try:
-                        if not isinstance(value, str):
-                            raise TypeError(
-                                f"Expected a str but got '{value.__class__.__name__}'"
-                            )
-                        value = value.lower()
-                        if value not in ("p", "f", "b"):
-                            raise ValueError(
-                                f"Expected one of p, f or b but got {value}"
-                            )
-                        xml_attributes[attribute.value] = value
-                    except (TypeError, ValueError) as e:
-                        raise TmxError(
-                            f"Value for attribute {attribute.name} must be a str and one of p, f or b but got {value} of type '{value.__class__.__name__}'"
-                        ) from e
-                case TmxAttributes.pos:
-                    try:
-                        if not isinstance(value, str):
-                            raise TypeError(
-                                f"Expected a str but got '{value.__class__.__name__}'"
-                            )
-                        value = value.lower()
-                        if value not in ("begin", "end"):
-                            raise ValueError(
-                                f"Expected one of begin or end but got {value}"
-                            )
-                        xml_attributes[attribute.value] = value
-                    except (TypeError, ValueError) as e:
-                        raise TmxError(
-                            f"Value for attribute {attribute.name} must be a str and one of begin or end but got {value} of type '{value.__class__.__name__}'"
-                        ) from e
-                case TmxAttributes.segtype:
-                    try:
-                        if not isinstance(value, str):
-                            raise TypeError(
-                                f"Expected a str but got '{value.__class__.__name__}'"
-                            )
-                        value = value.lower()
-                        if value not in ("block", "paragraph", "sentence", "phrase"):
-                            raise ValueError(
-                                f"Expected one of block, paragraph, sentence or phrase but got {value}"
-                            )
-                        xml_attributes[attribute.value] = value
-                    except (TypeError, ValueError) as e:
-                        raise TmxError(
-                            f"Value for attribute {attribute.name} must be a str and one of block, paragraph, sentence or phrase but got {value} of type '{value.__class__.__name__}'"
-                        ) from e
-                case TmxAttributes.unicode:
-                    try:
-                        if not isinstance(value, str):
-                            raise TypeError(
-                                f"Expected a str but got '{value.__class__.__name__}'"
-                            )
-                        if (
-                            getattr(self, "code") is None
-                            and getattr(self, "ent") is None
-                            and getattr(self, "subst") is None
-                        ):
-                            raise ValueError(
-                                "At least one the optional attributes must be set"
-                            )
-                        xml_attributes[attribute.value] = value
-                    except TypeError as e:
-                        raise TmxError(
-                            f"Value for attribute {attribute.name} must be a str and at least one the optional attributes must be set but got {value} of type '{value.__class__.__name__}'"
-                        ) from e
-                    except ValueError as e:
-                        raise TmxError(*e.args) from e
-                case _:
-                    try:
-                        if not isinstance(value, str):
-                            raise TypeError(
-                                f"Expected a str but got '{value.__class__.__name__}'"
-                            )
-                        xml_attributes[attribute.value] = value
-                    except TypeError as e:
-                        raise TmxError(
-                            f"Value for attribute {attribute.name} must be a str but got {value} of type '{value.__class__.__name__}'"
-                        ) from e
+                formatter = _format_str
+            xml_attributes[xml_name] = formatter(self, name, value)
         return xml_attributes
 
-    def to_element(self) -> _Element:
+    def _new_element(self, parent: Optional[_Element]) -> _Element:
+        """
+        Creates an lxml element with the element's tag and attributes, as the
+        last child of parent if one is given.
+        """
+        if parent is None:
+            return Element(self._tag, self.xml_attrib())
+        return SubElement(parent, self._tag, self.xml_attrib())
+
+    def to_element(self, parent: Optional[_Element] = None) -> _Element:
         """
         Converts a tmx element to a valid lxml element.
 
+        If parent is given, the element is created directly as its last child
+        rather than as a standalone element to be appended later.
+
         Raises a TmxError if:
             * the element contains unauthorized children (e.g. `Ude` elements in
             a `Tu` element)
@@ -251,30 +367,34 @@ class TmxElement:
 
         Returns an lxml element that represents that tmx element
         """
-        elem = Element(self.__class__.__name__.lower(), self.xml_attrib())
+        elem = self._new_element(parent)
         bpt, ept = 0, 0
         base, code = False, False
         elem.text = ""
         if hasattr(self, "props"):
-            elem.extend([prop.to_element() for prop in self.props])
+            for prop in self.props:
+                prop.to_element(elem)
         if hasattr(self, "notes"):
-            elem.extend([note.to_element() for note in self.notes])
+            for note in self.notes:
+                note.to_element(elem)
         if hasattr(self, "udes"):
-            elem.extend([ude.to_element() for ude in self.udes])
+            for ude in self.udes:
+                ude.to_element(elem)
         if hasattr(self, "maps"):
             for map_ in self.maps:
                 if not map_.code and not map_.ent and not map_.subst:
                     raise TmxError(
                         "At least one the optional element of a `Map` element must be set"
                     )
-                elem.append(map_.to_element())
+                map_.to_element(elem)
         if hasattr(self, "text"):
             elem.text = self.text
             return elem
         if hasattr(self, "segment"):
-            elem.append(self.segment.to_element())
+            self.segment.to_element(elem)
         if hasattr(self, "tuvs"):
-            elem.extend([tuv.to_element() for tuv in self.tuvs])
+            for tuv in self.tuvs:
+                tuv.to_element(elem)
         if self._content is not None:
             for item in self._content:
                 match item:
@@ -284,10 +404,8 @@ class TmxElement:
                         )
                     case str():
                         if len(elem):
-                            if elem[-1].tail:
-                                elem[-1].tail += item
-                            else:
-                                elem[-1].tail = item
+                            last = elem[-1]
+                            last.tail = (last.tail or "") + item
                         else:
                             elem.text += item
                     case TmxElement():
@@ -299,7 +417,7 @@ class TmxElement:
                             base = True
                         if hasattr(item, "code"):
                             base = True
-                        elem.append(item.to_element())
+                        item.to_element(elem)
             if bpt - ept > 0:
                 raise TmxError(
                     f"Element '{self.__class__.__name__}' has {bpt - ept} bpt element without their corresponding ept elements"
@@ -341,3 +459,20 @@ class TmxElement:
                 yield item
             if isinstance(item, TmxElement):
                 yield from item.iter(mask)
+
+
+# The descriptor of the _content slot, used to bypass the read-only guard.
+_CONTENT_SLOT: MemberDescriptorType = TmxElement.__dict__["_content"]
+
+
+def _content_guard(message: str) -> property:
+    """
+    Returns a `_content` property for elements that cannot have content.
+    Reading it goes straight to the underlying slot, assigning to it raises a
+    ValueError with the given message.
+    """
+
+    def forbid(self: TmxElement, value: Any) -> None:
+        raise ValueError(message)
+
+    return property(_CONTENT_SLOT.__get__, forbid)
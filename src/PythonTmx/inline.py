@@ -314,7 +314,7 @@ class Hi(TmxElement):
 
     """
 
-    _content: MutableSequence[Bpt | Ept | Ph | It | Ut | Self | str]
+    _content: "MutableSequence[Bpt | Ept | Ph | It | Ut | Hi | str]"
     _allowed_content = Bpt, Ept, Ph, It, Ut
     _required_attributes = tuple()
     _optional_attributes = TmxAttributes.x, TmxAttributes.type
@@ -337,18 +337,9 @@ class Hi(TmxElement):
                 self._content.append(source_element.text)
             if len(source_element):
                 for item in source_element:
-                    if item.tag == "bpt":
-                        self._content.append(Bpt(item))
-                    if item.tag == "ept":
-                        self._content.append(Ept(item))
-                    if item.tag == "ph":
-                        self._content.append(Ph(item))
-                    if item.tag == "hi":
-                        self._content.append(Hi(item))  # type:ignore
-                    if item.tag == "it":
-                        self._content.append(It(item))
-                    if item.tag == "ut":
-                        self._content.append(Ut(item))
+                    element_class = _INLINE_CLASSES.get(item.tag)
+                    if element_class is not None:
+                        self._content.append(element_class(source_element=item))
                     if item.tail:
                         self._content.append(item.tail)
         elif content is not None:
@@ -403,19 +394,21 @@ class Sub(TmxElement):  # type: ignore
                 self._content.append(source_element.text)
             if len(source_element):
                 for item in source_element:
-                    if item.tag == "bpt":
-                        self._content.append(Bpt(item))
-                    if item.tag == "ept":
-                        self._content.append(Ept(item))
-                    if item.tag == "ph":
-                        self._content.append(Ph(item))
-                    if item.tag == "hi":
-                        self._content.append(Hi(item))
-                    if item.tag == "it":
-                        self._content.append(It(item))
-                    if item.tag == "ut":
-                        self._content.append(Ut(item))
+                    element_class = _INLINE_CLASSES.get(item.tag)
+                    if element_class is not None:
+                        self._content.append(element_class(source_element=item))
                     if item.tail:
                         self._content.append(item.tail)
         elif content is not None:
             self._content.extend(content)
+
+
+# Classes of the elements that can appear inside `Hi` and `Sub`, by tag.
+_INLINE_CLASSES: dict[str, type[Bpt | Ept | Ph | Hi | It | Ut]] = {
+    "bpt": Bpt,
+    "ept": Ept,
+    "ph": Ph,
+    "hi": Hi,
+    "it": It,
+    "ut": Ut,
+}
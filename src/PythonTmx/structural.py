@@ -1,8 +1,9 @@
 from csv import writer
 from datetime import datetime
-from os import PathLike
+from os import PathLike, fsdecode, remove, replace
+from os.path import exists
 from typing import (
-    Any,
+    IO,
     Generator,
     Iterable,
     Literal,
@@ -10,8 +11,9 @@ from typing import (
     Optional,
     override,
 )
+from uuid import uuid4
 
-from lxml.etree import Element, ElementTree, _Element, _ElementTree, tostring
+from lxml.etree import SubElement, _Element, tostring, xmlfile
 
 from .base import (
     ExtraTailError,
@@ -19,10 +21,26 @@ from .base import (
     TmxAttributes,
     TmxElement,
 )
-from .inline import Bpt, Ept, Hi, It, Ph, Sub, Ut
+from .inline import _INLINE_CLASSES, Bpt, Ept, Hi, It, Ph, Sub, Ut
 
 __all__ = ["Header", "Seg", "Tmx", "Tu", "Tuv", "Prop", "Note", "Map", "Ude"]
 
+# Classes of the elements that can appear inside `Seg`, by tag.
+_SEG_CLASSES: dict[str, type[Bpt | Ept | Ph | Hi | It | Ut | Sub]] = {
+    **_INLINE_CLASSES,
+    "sub": Sub,
+}
+
+
+def _inner_xml(element: _Element) -> str:
+    """
+    Returns the serialized content of an element, without its own start and
+    end tags.
+    """
+    _, _, content = tostring(element, encoding="unicode").partition(">")
+    content, _, _ = content.rpartition("<")
+    return content
+
 
 class Prop(TmxElement):
     """
@@ -63,6 +81,7 @@ class Prop(TmxElement):
     Contents: None
     """
 
+    __slots__ = ("text", "type", "xmllang", "oencoding")
     text: str
     type: str
     xmllang: Optional[str]
@@ -70,6 +89,10 @@ class Prop(TmxElement):
     _required_attributes = (TmxAttributes.type,)
     _optional_attributes = TmxAttributes.xmllang, TmxAttributes.oencoding
     _allowed_content = (str,)
+    _content_error = (
+        "Prop elements are not allowed to have content. "
+        "Please use the 'text' property instead"
+    )
 
     def __init__(
         self,
@@ -88,19 +111,11 @@ class Prop(TmxElement):
         if text is None:
             text = ""
         if source_element is not None:
-            self.text = source_element.text if source_element.text is not None else text
+            source_text = source_element.text
+            self.text = source_text if source_text is not None else text
         else:
             self.text = text
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Prop elements are not allowed to have content. "
-                "Please use the 'text' property instead"
-            )
-        return super().__setattr__(name, value)
-
 
 class Note(TmxElement):
     """
@@ -128,12 +143,17 @@ class Note(TmxElement):
     Contents: None
     """
 
+    __slots__ = ("text", "xmllang", "oencoding")
     text: str
     xmllang: Optional[str]
     oencoding: Optional[str]
     _required_attributes = tuple()
     _optional_attributes = TmxAttributes.xmllang, TmxAttributes.oencoding
     _allowed_content = (str,)
+    _content_error = (
+        "Note elements are not allowed to have content. "
+        "Please use the 'text' property instead"
+    )
 
     def __init__(
         self,
@@ -150,19 +170,11 @@ class Note(TmxElement):
         if text is None:
             text = ""
         if source_element is not None:
-            self.text = source_element.text if source_element.text is not None else text
+            source_text = source_element.text
+            self.text = source_text if source_text is not None else text
         else:
             self.text = text
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Note elements are not allowed to have content. "
-                "Please use the 'text' property instead"
-            )
-        return super().__setattr__(name, value)
-
 
 class Map(TmxElement):
     """
@@ -200,6 +212,9 @@ class Map(TmxElement):
     _required_attributes = (TmxAttributes.unicode,)
     _optional_attributes = TmxAttributes.code, TmxAttributes.ent, TmxAttributes.subst
     _allowed_content = tuple()
+    _content_error = (
+        "Map elements are empty elements and are not allowed to have content"
+    )
 
     def __init__(
         self,
@@ -217,14 +232,6 @@ class Map(TmxElement):
             subst=subst,
         )
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Map elements are empty elements and are not allowed to have content"
-            )
-        return super().__setattr__(name, value)
-
 
 class Ude(TmxElement):
     """
@@ -272,13 +279,15 @@ class Ude(TmxElement):
         )
         self.maps = []
         if source_element is not None:
-            if source_element.text:
-                raise ExtraTextError("ude", source_element.text)
-            if source_element.tail:
-                raise ExtraTailError("ude", source_element.tail)
+            text, tail = source_element.text, source_element.tail
+            if text and not text.isspace():
+                raise ExtraTextError("ude", text)
+            if tail and not tail.isspace():
+                raise ExtraTailError("ude", tail)
             if len(source_element):
+                maps_append = self.maps.append
                 for map_ in source_element:
-                    self.maps.append(Map(map_))
+                    maps_append(Map(map_))
         if not len(self.maps) and maps is not None:
             self.maps.extend(maps)
 
@@ -368,6 +377,10 @@ class Header(TmxElement):
         TmxAttributes.changeid,
     )
     _allowed_content = tuple()
+    _content_error = (
+        "header elements are not allowed to have content. "
+        "Please use the 'udes', 'props' or 'notes' properties instead"
+    )
     creationtool: str
     creationtoolversion: str
     segtype: Literal["block", "paragraph", "sentence", "phrase"]
@@ -418,20 +431,18 @@ class Header(TmxElement):
             changedate=changedate,
             changeid=changeid,
         )
-        self.notes, self.props, self.udes = [], [], []
         if source_element is not None:
-            if source_element.text:
-                raise ExtraTextError("header", source_element.text)
-            if source_element.tail:
-                raise ExtraTailError("header", source_element.tail)
-            if len(source_element):
-                for item in source_element:
-                    if item.tag == "ude":
-                        self.udes.append(Ude(item))
-                    if item.tag == "note":
-                        self.notes.append(Note(item))
-                    if item.tag == "prop":
-                        self.props.append(Prop(item))
+            text, tail = source_element.text, source_element.tail
+            if text and not text.isspace():
+                raise ExtraTextError("header", text)
+            if tail and not tail.isspace():
+                raise ExtraTailError("header", tail)
+        if source_element is not None and len(source_element):
+            self.udes = [Ude(item) for item in source_element.iterchildren("ude")]
+            self.notes = [Note(item) for item in source_element.iterchildren("note")]
+            self.props = [Prop(item) for item in source_element.iterchildren("prop")]
+        else:
+            self.notes, self.props, self.udes = [], [], []
         if not len(self.notes) and notes is not None:
             self.notes.extend(notes)
         if not len(self.props) and props is not None:
@@ -439,15 +450,6 @@ class Header(TmxElement):
         if not len(self.udes) and udes is not None:
             self.udes.extend(udes)
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "header elements are not allowed to have content. "
-                "Please use the 'udes', 'props' or 'notes' properties instead"
-            )
-        return super().__setattr__(name, value)
-
     def __iter__(self) -> Generator[Ude, None, None]:
         yield from self.udes
 
@@ -546,26 +548,22 @@ class Seg(TmxElement):
     ) -> None:
         super().__init__(source_element=source_element, datatype=datatype, type=type)
         if source_element is not None:
+            # Joined so that the segment never holds two str next to each other.
+            text_buffer: list[str] = []
+            content_append = self._content.append
             if source_element.text:
-                self._content.append(source_element.text)
-            if len(source_element):
-                for item in source_element:
-                    if item.tag == "bpt":
-                        self._content.append(Bpt(item))
-                    if item.tag == "ept":
-                        self._content.append(Ept(item))
-                    if item.tag == "ph":
-                        self._content.append(Ph(item))
-                    if item.tag == "hi":
-                        self._content.append(Hi(item))
-                    if item.tag == "it":
-                        self._content.append(It(item))
-                    if item.tag == "ut":
-                        self._content.append(Ut(item))
-                    if item.tag == "sub":
-                        self._content.append(Sub(source_element=item))
-                    if item.tail:
-                        self._content.append(item.tail)
+                text_buffer.append(source_element.text)
+            for item in source_element:
+                element_class = _SEG_CLASSES.get(item.tag)
+                if element_class is not None:
+                    if text_buffer:
+                        content_append("".join(text_buffer))
+                        text_buffer.clear()
+                    content_append(element_class(source_element=item))
+                if item.tail:
+                    text_buffer.append(item.tail)
+            if text_buffer:
+                content_append("".join(text_buffer))
         elif content is not None:
             self._content.extend(content)
 
@@ -630,6 +628,23 @@ class Tuv(TmxElement):
     or segment thereof have been generated.
     """
 
+    __slots__ = (
+        "segment",
+        "notes",
+        "props",
+        "xmllang",
+        "oencoding",
+        "datatype",
+        "usagecount",
+        "lastusagedate",
+        "creationtool",
+        "creationtoolversion",
+        "creationdate",
+        "creationid",
+        "changedate",
+        "changeid",
+        "otmf",
+    )
     _required_attributes = (TmxAttributes.xmllang,)
     _optional_attributes = (
         TmxAttributes.oencoding,
@@ -646,6 +661,10 @@ class Tuv(TmxElement):
     )
     segment: Seg
     _allowed_content = tuple()
+    _content_error = (
+        "Tuv elements are not allowed to have content. "
+        "Please use the 'segment' property instead"
+    )
     xmllang: Optional[str]
     oencoding: Optional[str]
     datatype: Optional[str]
@@ -695,20 +714,19 @@ class Tuv(TmxElement):
             changeid=changeid,
             otmf=otmf,
         )
-        self.notes, self.props = [], []
         if source_element is not None:
-            if source_element.text:
-                raise ExtraTextError("tuv", source_element.text)
-            if source_element.tail:
-                raise ExtraTailError("tuv", source_element.tail)
-            if len(source_element):
-                for item in source_element:
-                    if item.tag == "seg":
-                        self.segment = Seg(item)
-                    if item.tag == "note":
-                        self.notes.append(Note(item))
-                    if item.tag == "prop":
-                        self.props.append(Prop(item))
+            text, tail = source_element.text, source_element.tail
+            if text and not text.isspace():
+                raise ExtraTextError("tuv", text)
+            if tail and not tail.isspace():
+                raise ExtraTailError("tuv", tail)
+        if source_element is not None and len(source_element):
+            for item in source_element.iterchildren("seg"):
+                self.segment = Seg(item)
+            self.notes = [Note(item) for item in source_element.iterchildren("note")]
+            self.props = [Prop(item) for item in source_element.iterchildren("prop")]
+        else:
+            self.notes, self.props = [], []
         if not hasattr(self, "segment"):
             self.segment = segment if segment is not None else Seg()
         if not len(self.notes) and notes is not None:
@@ -716,20 +734,22 @@ class Tuv(TmxElement):
         if not len(self.props) and props is not None:
             self.props.extend(props)
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Tuv elements are not allowed to have content. "
-                "Please use the 'segment' property instead"
-            )
-        return super().__setattr__(name, value)
-
     def __iter__(
         self,
     ) -> Generator[str | TmxElement, None, None]:
         yield from self.segment
 
+    @override
+    def to_element(self, parent: Optional[_Element] = None) -> _Element:
+        elem = self._new_element(parent)
+        elem.text = ""
+        for prop in self.props:
+            prop.to_element(elem)
+        for note in self.notes:
+            note.to_element(elem)
+        self.segment.to_element(elem)
+        return elem
+
     def add_prop(
         self,
         type: str,
@@ -824,6 +844,25 @@ class Tu(TmxElement):
     The language of the source text.lang: str
     """
 
+    __slots__ = (
+        "tuvs",
+        "notes",
+        "props",
+        "tuid",
+        "oencoding",
+        "datatype",
+        "usagecount",
+        "lastusagedate",
+        "creationtool",
+        "creationtoolversion",
+        "creationdate",
+        "creationid",
+        "changedate",
+        "segtype",
+        "changeid",
+        "otmf",
+        "srclang",
+    )
     _required_attributes = tuple()
     _optional_attributes = (
         TmxAttributes.tuid,
@@ -842,6 +881,10 @@ class Tu(TmxElement):
         TmxAttributes.srclang,
     )
     _allowed_content = ()
+    _content_error = (
+        "Tu elements are not allowed to have content. "
+        "Please use the 'tuvs' property instead"
+    )
     tuvs: MutableSequence[Tuv]
     tuid: Optional[str]
     xmllang: Optional[str]
@@ -901,20 +944,18 @@ class Tu(TmxElement):
             otmf=otmf,
             srclang=srclang,
         )
-        self.notes, self.props, self.tuvs = [], [], []
         if source_element is not None:
-            if source_element.text:
-                raise ExtraTextError("tu", source_element.text)
-            if source_element.tail:
-                raise ExtraTailError("tu", source_element.tail)
-            if len(source_element):
-                for item in source_element:
-                    if item.tag == "tuv":
-                        self.tuvs.append(Tuv(item))
-                    if item.tag == "note":
-                        self.notes.append(Note(item))
-                    if item.tag == "prop":
-                        self.props.append(Prop(item))
+            text, tail = source_element.text, source_element.tail
+            if text and not text.isspace():
+                raise ExtraTextError("tu", text)
+            if tail and not tail.isspace():
+                raise ExtraTailError("tu", tail)
+        if source_element is not None and len(source_element):
+            self.tuvs = [Tuv(item) for item in source_element.iterchildren("tuv")]
+            self.notes = [Note(item) for item in source_element.iterchildren("note")]
+            self.props = [Prop(item) for item in source_element.iterchildren("prop")]
+        else:
+            self.notes, self.props, self.tuvs = [], [], []
         if not len(self.tuvs) and tuvs is not None:
             self.tuvs.extend(tuvs)
         if not len(self.notes) and notes is not None:
@@ -922,18 +963,21 @@ class Tu(TmxElement):
         if not len(self.props) and props is not None:
             self.props.extend(props)
 
-    @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Tu elements are not allowed to have content. "
-                "Please use the 'tuvs' property instead"
-            )
-        return super().__setattr__(name, value)
-
     def __iter__(self) -> Generator[Tuv, None, None]:
         yield from self.tuvs
 
+    @override
+    def to_element(self, parent: Optional[_Element] = None) -> _Element:
+        elem = self._new_element(parent)
+        elem.text = ""
+        for prop in self.props:
+            prop.to_element(elem)
+        for note in self.notes:
+            note.to_element(elem)
+        for tuv in self.tuvs:
+            tuv.to_element(elem)
+        return elem
+
     def add_prop(
         self,
         type: str,
@@ -999,7 +1043,12 @@ class Tmx(TmxElement):
     None
     """
 
+    __slots__ = ("version", "header", "tus")
     _allowed_content = ()
+    _content_error = (
+        "Tmx elements are not allowed to have content. "
+        "Please use the 'tus' property instead"
+    )
     _required_attributes = (TmxAttributes.version,)
     _optional_attributes = tuple()
     version: str
@@ -1015,18 +1064,20 @@ class Tmx(TmxElement):
         super().__init__(source_element=source_element, version="1.4")
         self.tus = []
         if source_element is not None:
-            if source_element.text:
-                raise ExtraTextError("tmx", source_element.text)
-            if source_element.tail:
-                raise ExtraTailError("tmx", source_element.tail)
+            text, tail = source_element.text, source_element.tail
+            if text and not text.isspace():
+                raise ExtraTextError("tmx", text)
+            if tail and not tail.isspace():
+                raise ExtraTailError("tmx", tail)
             if len(source_element):
+                tus_append = self.tus.append
                 for item in source_element:
-                    if item.tag == "body":
-                        for tu in item:
-                            if tu.tag == "tu":
-                                self.tus.append(Tu(tu))
-                    if item.tag == "header":
-                        self.header = Header(item)
+                    match item.tag:
+                        case "body":
+                            for tu in item.iterchildren("tu"):
+                                tus_append(Tu(tu))
+                        case "header":
+                            self.header = Header(item)
         if not hasattr(self, "header"):
             self.header = header if header is not None else Header()
         if not len(self.tus) and tus is not None:
@@ -1036,43 +1087,53 @@ class Tmx(TmxElement):
         yield from self.tus
 
     @override
-    def __setattr__(self, name: str, value: Any) -> None:
-        if name == "_content":
-            raise ValueError(
-                "Tu elements are not allowed to have content. "
-                "Please use the 'tuvs' property instead"
-            )
-        return super().__setattr__(name, value)
-
-    @override
-    def to_element(self) -> _Element:
-        elem = Element("tmx", version=self.version)
-        elem.append(self.header.to_element())
-        body = Element("body")
-        elem.append(body)
+    def to_element(self, parent: Optional[_Element] = None) -> _Element:
+        elem = self._new_element(parent)
+        self.header.to_element(elem)
+        body = SubElement(elem, "body")
         for tu in self.tus:
-            body.append(tu.to_element())
+            tu.to_element(body)
         return elem
 
     def to_tmx(self, file: str | bytes | PathLike, encoding: str = "utf-8") -> None:
         """
         Writes the element to a file using lxml.
 
+        The document is written incrementally, each `Tu` is converted and
+        written on its own so the whole tree never has to be held in memory.
+        When given a path, the document is first written to a temporary file
+        next to it, which only replaces the target once everything has been
+        written, so a failing `Tu` never leaves a truncated file behind.
+
         Arguments:
             file {str | bytes | PathLike | StringIO | BytesIO} -- A valid file
             path or file descriptor, or IO.
         """
-        tree: _ElementTree = ElementTree(self.to_element())
-        with open(file, "w", encoding=encoding) as f:
-            tree.write(f, xml_declaration=True)
+        if not isinstance(file, (str, bytes, PathLike)):
+            self._write_tmx(file, encoding)
+            return
+        path = fsdecode(file)
+        temp = f"{path}.{uuid4().hex}.tmp"
+        try:
+            with open(temp, "xb") as f:
+                self._write_tmx(f, encoding)
+            replace(temp, path)
+        except BaseException:
+            if exists(temp):
+                remove(temp)
+            raise
+
+    def _write_tmx(self, file: IO | int, encoding: str) -> None:
+        with xmlfile(file, encoding=encoding) as xf:
+            xf.write_declaration()
+            with xf.element(self._tag, self.xml_attrib()):
+                xf.write(self.header.to_element())
+                with xf.element("body"):
+                    for tu in self.tus:
+                        xf.write(tu.to_element())
 
     def to_csv(self, file: str | bytes | PathLike) -> None:
-        with open(file, "w", newline="") as f:
-            csv_writer = writer(f)
-            for tu in self:
-                csv_writer.writerow(
-                    [
-                        tostring(tuv.segment.to_element())[5:-6].decode()
-                        for tuv in tu.tuvs
-                    ]
-                )
+        with open(file, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+            writer(f).writerows(
+                [_inner_xml(tuv.segment.to_element()) for tuv in tu.tuvs] for tu in self
+            )
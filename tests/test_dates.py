@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from lxml.etree import fromstring
+
+from PythonTmx import Tu
+
+
+def test_dates_are_parsed():
+    tu = Tu(fromstring('<tu creationdate="20240102T030405Z" usagecount="3"/>'))
+    assert tu.creationdate == datetime(2024, 1, 2, 3, 4, 5)
+    assert tu.usagecount == 3
+
+
+def test_absent_values_stay_none():
+    tu = Tu(fromstring("<tu/>"))
+    assert tu.creationdate is None
+    assert tu.changedate is None
+    assert tu.usagecount is None
+
+
+def test_malformed_dates_are_kept_as_is():
+    tu = Tu(fromstring('<tu changedate="yesterday"/>'))
+    assert tu.changedate == "yesterday"
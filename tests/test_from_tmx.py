@@ -0,0 +1,96 @@
+import pytest
+from lxml.etree import fromstring, tostring
+
+from PythonTmx import Tmx, from_tmx
+from PythonTmx.base import ExtraTailError, ExtraTextError, TmxtagError
+
+HEADER = (
+    '<header creationtool="test" creationtoolversion="1" segtype="block" '
+    'o-tmf="test" adminlang="en" srclang="en" datatype="plaintext"/>'
+)
+
+
+def write(tmp_path, content: str):
+    file = tmp_path / "file.tmx"
+    file.write_text(content, encoding="utf-8")
+    return file
+
+
+def tu(text: str) -> str:
+    return f'<tu><tuv xml:lang="en"><seg>{text}</seg></tuv></tu>'
+
+
+def test_internal_entities_are_expanded(tmp_path):
+    content = (
+        '<?xml version="1.0"?>\n'
+        '<!DOCTYPE tmx [<!ENTITY foo "FOO">]>\n'
+        f'<tmx version="1.4">{HEADER}<body>{tu("a&foo;b")}</body></tmx>'
+    )
+    tmx = from_tmx(write(tmp_path, content))
+    assert list(tmx.tus[0].tuvs[0].segment) == ["aFOOb"]
+
+
+def test_same_result_as_tmx(tmp_path):
+    content = (
+        f'<tmx version="1.4">{HEADER}<body>{tu("a")}{tu("b<ph>c</ph>d")}</body></tmx>'
+    )
+    loaded = from_tmx(write(tmp_path, content))
+    parsed = Tmx(fromstring(content))
+    assert loaded.version == parsed.version == "1.4"
+    assert tostring(loaded.to_element()) == tostring(parsed.to_element())
+
+
+def test_version_is_read(tmp_path):
+    content = f'<tmx version="1.1">{HEADER}<body/></tmx>'
+    assert from_tmx(write(tmp_path, content)).version == "1.1"
+
+
+def test_text_in_tmx_raises(tmp_path):
+    content = f'<tmx version="1.4">junk{HEADER}<body>{tu("a")}</body></tmx>'
+    with pytest.raises(ExtraTextError):
+        from_tmx(write(tmp_path, content))
+
+
+def test_wrong_root_raises_before_tus_are_converted(tmp_path):
+    # The tu is invalid, the root tag has to be rejected before reaching it.
+    content = "<foo><body><tu>junk</tu></body></foo>"
+    with pytest.raises(TmxtagError):
+        from_tmx(write(tmp_path, content))
+
+
+def test_wrong_root_without_children_raises(tmp_path):
+    with pytest.raises(TmxtagError):
+        from_tmx(write(tmp_path, "<foo/>"))
+
+
+def test_only_tus_in_body_are_loaded(tmp_path):
+    content = (
+        f'<tmx version="1.4">{HEADER}<body>{tu("kept")}'
+        f"<tu><tuv xml:lang=\"en\"><seg>x</seg>{tu('nested')}</tuv></tu>"
+        f"</body></tmx>"
+    )
+    tmx = from_tmx(write(tmp_path, content))
+    assert [list(tu.tuvs[0].segment) for tu in tmx.tus] == [["kept"], ["x"]]
+
+
+def test_tail_at_chunk_boundary_raises(tmp_path):
+    # lxml feeds iterparse 32 KiB at a time, slide the stray text across that
+    # boundary so that some tus end before their tail has been read.
+    start = f'<tmx version="1.4">{HEADER}<body>'
+    size = 32768 - len(start) - len(tu(""))
+    for padding in range(size - 8, size + 8):
+        content = f'{start}{tu("x" * padding)}junk{tu("b")}</body></tmx>'
+        with pytest.raises(ExtraTailError):
+            from_tmx(write(tmp_path, content))
+        content = f'{start}{tu("x" * padding)}junk</body></tmx>'
+        with pytest.raises(ExtraTailError):
+            from_tmx(write(tmp_path, content))
+
+
+def test_header_tail_at_chunk_boundary_raises(tmp_path):
+    start = f'<tmx version="1.4">{HEADER}'
+    for padding in range(32768 - len(start) - 8, 32768 - len(start) + 8):
+        header = HEADER.replace("plaintext", "x" * padding)
+        content = f'<tmx version="1.4">{header}junk<body>{tu("a")}</body></tmx>'
+        with pytest.raises(ExtraTailError):
+            from_tmx(write(tmp_path, content))
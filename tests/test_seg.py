@@ -0,0 +1,27 @@
+from lxml.etree import fromstring
+
+from PythonTmx import Ph, Seg
+
+
+def test_content_is_a_list():
+    seg = Seg(fromstring("<seg>a<ph>x</ph>b</seg>"))
+    assert isinstance(seg._content, list)
+    assert seg._content[1:] == [seg._content[1], "b"]
+    assert isinstance(seg._content[1], Ph)
+
+
+def test_text_around_unknown_tags_is_joined():
+    seg = Seg(fromstring("<seg>a<foo>x</foo>b<ph>y</ph>c</seg>"))
+    assert seg._content[0] == "ab"
+    assert seg._content[2] == "c"
+
+
+def test_user_subclasses_do_not_change_parsing():
+    from PythonTmx.base import TmxElement
+
+    class Ph(TmxElement):  # noqa: F811
+        pass
+
+    seg = Seg(fromstring("<seg>a<ph>x</ph>b</seg>"))
+    assert type(seg._content[1]) is not Ph
+    assert seg._content[1].__class__.__module__ == "PythonTmx.inline"
@@ -0,0 +1,44 @@
+import pytest
+from lxml.etree import fromstring
+
+from PythonTmx import Header, Seg, Tmx, Tu, Tuv
+from PythonTmx.base import TmxError
+
+
+def tmx() -> Tmx:
+    header = Header(
+        creationtool="test",
+        creationtoolversion="1",
+        segtype="block",
+        otmf="test",
+        adminlang="en",
+        srclang="en",
+        datatype="plaintext",
+    )
+    tu = Tu(tuvs=[Tuv(xmllang="en", segment=Seg(fromstring("<seg>a</seg>")))])
+    return Tmx(header=header, tus=[tu])
+
+
+def test_failing_tu_keeps_previous_file(tmp_path):
+    file = tmp_path / "file.tmx"
+    file.write_text("previous", encoding="utf-8")
+    document = tmx()
+    document.tus.append(Tu(segtype="bogus"))
+    with pytest.raises(TmxError):
+        document.to_tmx(file)
+    assert file.read_text(encoding="utf-8") == "previous"
+    assert list(tmp_path.iterdir()) == [file]
+
+
+def test_version_is_validated(tmp_path):
+    document = tmx()
+    document.version = 1
+    with pytest.raises(TmxError):
+        document.to_tmx(tmp_path / "file.tmx")
+    assert not list(tmp_path.iterdir())
+
+
+def test_written_file_can_be_read_back(tmp_path):
+    file = tmp_path / "file.tmx"
+    tmx().to_tmx(file)
+    assert list(Tmx(fromstring(file.read_bytes())).tus[0].tuvs[0].segment) == ["a"]